@@ -1,20 +1,66 @@
-from flask import Flask, render_template, redirect, url_for, flash, request, abort, jsonify
+from flask import Flask, render_template, stream_template, redirect, url_for, flash, request, abort, jsonify
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import and_, event, func, insert, inspect, or_, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import contains_eager, joinedload, raiseload
+from sqlalchemy.pool import QueuePool
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
 from flask_login import LoginManager, login_user, login_required, logout_user, current_user, UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError, InvalidHashError
 from datetime import datetime
-from functools import wraps
+from functools import lru_cache, wraps
+import hashlib
+import os
+import re
+import sqlite3
 import time 
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'change-this-to-a-secure-random-value' 
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///farmers.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Reuse warm SQLite connections (and their page caches) across requests
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'poolclass': QueuePool,
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_recycle': 1800,
+    'connect_args': {'check_same_thread': False},
+}
 
 db = SQLAlchemy(app)
+
+# WAL lets readers run alongside writers and NORMAL sync needs fewer fsyncs per commit
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA cache_size=-64000')
+    cursor.execute('PRAGMA mmap_size=268435456')
+    cursor.close()
+
 login_manager = LoginManager(app)
 login_manager.login_view = 'login'
 
+# Login attempts are limited per submitted username and client address
+def login_rate_key():
+    return f"{request.form.get('username', '')}|{get_remote_address()}"
+
+limiter = Limiter(key_func=login_rate_key, app=app, storage_uri='memory://')
+
+# Longer passwords are truncated before hashing to bound per-request CPU cost
+MAX_PASSWORD_LENGTH = 128
+
+# Argon2id tuned for roughly 150-250 ms per hash, spread over two lanes
+password_hasher = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=2)
+
 # Models
 class User(db.Model, UserMixin):
     id = db.Column(db.Integer, primary_key=True)
@@ -23,15 +69,30 @@ class User(db.Model, UserMixin):
     role = db.Column(db.String(20), nullable=False)  # farmer, customer, or admin
     name = db.Column(db.String(100))
     contact_number = db.Column(db.String(20))
+    # Unread orders across this farmer's products, kept up to date on write
+    new_order_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
 
     products = db.relationship('Product', backref='farmer', lazy=True)
     orders = db.relationship('Order', backref='customer', lazy=True)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        password = password[:MAX_PASSWORD_LENGTH]
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        # Accounts created before the argon2 switch still hold werkzeug hashes
+        if not self.password_hash.startswith('$argon2'):
+            return check_password_hash(self.password_hash, password)
+        password = password[:MAX_PASSWORD_LENGTH]
+        try:
+            return password_hasher.verify(self.password_hash, password)
+        except (VerifyMismatchError, InvalidHashError):
+            return False
+
+    def password_needs_rehash(self):
+        if not self.password_hash.startswith('$argon2'):
+            return True
+        return password_hasher.check_needs_rehash(self.password_hash)
 
     def is_farmer(self):
         return self.role == 'farmer'
@@ -43,6 +104,11 @@ class User(db.Model, UserMixin):
         return self.role == 'admin'
 
 class Product(db.Model):
+    __table_args__ = (
+        db.Index('ix_product_farmer', 'farmer_id'),
+        db.Index('ix_product_created', 'created_at', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     farmer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     name = db.Column(db.String(120), nullable=False)
@@ -55,6 +121,11 @@ class Product(db.Model):
     orders = db.relationship('Order', backref='product', lazy=True)
 
 class Order(db.Model):
+    __table_args__ = (
+        db.Index('ix_order_product_isnew', 'product_id', 'is_new'),
+        db.Index('ix_order_customer_date', 'customer_id', 'order_date'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     customer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     product_id = db.Column(db.Integer, db.ForeignKey('product.id'), nullable=False)
@@ -63,44 +134,99 @@ class Order(db.Model):
     order_date = db.Column(db.DateTime, default=datetime.utcnow)
     is_new = db.Column(db.Boolean, default=True)
 
+# Bump the owning farmer's unread counter whenever a new order is placed.
+# ORM mapper events do not fire for Core/bulk inserts of Order.
+@event.listens_for(Order, 'after_insert')
+def count_new_order(mapper, connection, target):
+    if not target.is_new:
+        return
+    farmer_id = select(Product.farmer_id).where(Product.id == target.product_id).scalar_subquery()
+    connection.execute(
+        update(User).where(User.id == farmer_id).values(new_order_count=User.new_order_count + 1)
+    )
+
 # User loader for flask-login
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    # session.get() checks the identity map before querying; Flask-Login caches
+    # the result for the rest of the request
+    return db.session.get(User, int(user_id))
 
 # Role-based access decorator
 def role_required(role):
+    # Bind everything the wrapper needs as closure locals, resolved once per route
+    unauthorized = login_manager.unauthorized
     def decorator(f):
         @wraps(f)
         def wrapped(*args, **kwargs):
-            if not current_user.is_authenticated:
-                return login_manager.unauthorized()
-            if current_user.role != role:
+            user = current_user
+            if not user.is_authenticated:
+                return unauthorized()
+            if user.role != role:
                 abort(403)
             return f(*args, **kwargs)
         return wrapped
     return decorator
 
+# Streamed listings are fetched in batches of this many rows rather than all at once
+STREAM_BATCH_SIZE = 200
+
+def stream_scalars(stmt):
+    """
+    Yields the objects of a select() in yield_per batches for use with
+    stream_template. The query only runs once the template starts iterating,
+    inside the streamed response's context, and can be iterated once, so
+    templates should use `{% for %}...{% else %}` rather than `{% if %}`.
+    """
+    yield from db.session.execute(stmt.execution_options(yield_per=STREAM_BATCH_SIZE)).scalars()
+
 # --- AI FEATURE: Image Generation Logic ---
+# Keyword -> image table, in priority order; earlier keywords win when several match
+_AI_IMAGES = {
+    'tomato': '/static/images/ai_tomatoes.jpg',
+    'spinach': '/static/images/ai_spinach.jpg',
+    'cabbage': '/static/images/ai_cabbage.jpg',
+}
+# All keywords compiled into one alternation so a name is scanned in a single pass
+_AI_IMAGE_RE = re.compile('|'.join(map(re.escape, _AI_IMAGES)), re.IGNORECASE)
+_AI_IMAGE_PRIORITY = {keyword: rank for rank, keyword in enumerate(_AI_IMAGES)}
+# Fallback for all other products
+_DEFAULT_AI_IMAGE = '/static/images/default_ai_product.jpg'
+
+# Content hash of each generated image that exists on disk, computed once at startup
+# for cache busting; images that are missing are served unversioned
+def _hash_static_images():
+    hashes = {}
+    for path in (*_AI_IMAGES.values(), _DEFAULT_AI_IMAGE):
+        filename = os.path.join(app.static_folder, path[len('/static/'):])
+        if os.path.isfile(filename):
+            with open(filename, 'rb') as f:
+                hashes[path] = hashlib.sha256(f.read()).hexdigest()[:12]
+    return hashes
+
+_IMAGE_HASH = _hash_static_images()
+
+# Pure function of the name (image hashes are fixed at startup), so memoize it
+@lru_cache(maxsize=1024)
 def generate_product_image_url(product_name):
     """
     Simulates calling an AI image generation API based on the product name.
     """
-    name_lower = product_name.lower()
-    
-    if 'tomato' in name_lower:
-        base_path = '/static/images/ai_tomatoes.jpg'
-    elif 'spinach' in name_lower:
-        base_path = '/static/images/ai_spinach.jpg'
-    elif 'cabbage' in name_lower:
-        base_path = '/static/images/ai_cabbage.jpg'
-    else:
-        # Fallback for all other products
-        base_path = '/static/images/default_ai_product.jpg' 
-
+    keywords = {match.group(0).lower() for match in _AI_IMAGE_RE.finditer(product_name)}
+    base_path = _AI_IMAGES[min(keywords, key=_AI_IMAGE_PRIORITY.get)] if keywords else _DEFAULT_AI_IMAGE
+    if base_path in _IMAGE_HASH:
+        return f'{base_path}?v={_IMAGE_HASH[base_path]}'
     return base_path
 # --- END AI FEATURE ---
 
+# Versioned image URLs change whenever the file does, so browsers may cache them forever
+@app.after_request
+def cache_versioned_images(response):
+    version = request.args.get('v')
+    if response.status_code == 200 and version and version == _IMAGE_HASH.get(request.path):
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
 # Routes
 @app.route('/')
 def index():
@@ -109,9 +235,9 @@ def index():
         return render_template('index.html')
         
     # If authenticated, redirect based on role
-    if current_user.is_admin():
+    if current_user.role == 'admin':
         return redirect(url_for('admin_dashboard'))
-    elif current_user.is_farmer():
+    elif current_user.role == 'farmer':
         return redirect(url_for('farmer_dashboard'))
     else:
         # Default for authenticated customer
@@ -120,6 +246,7 @@ def index():
 
 
 @app.route('/register', methods=['GET', 'POST'])
+@limiter.limit('3/minute', methods=['POST'], key_func=get_remote_address)
 def register():
     if current_user.is_authenticated:
         return redirect(url_for('index'))
@@ -151,6 +278,7 @@ def register():
     return render_template('register.html')
 
 @app.route('/login', methods=['GET', 'POST'])
+@limiter.limit('5/minute', methods=['POST'])
 def login():
     if current_user.is_authenticated:
         return redirect(url_for('index'))
@@ -159,6 +287,10 @@ def login():
         password = request.form.get('password')
         user = User.query.filter_by(username=username).first()
         if user and user.check_password(password):
+            # Migrate legacy or outdated hashes while we have the plain password
+            if user.password_needs_rehash():
+                user.set_password(password)
+                db.session.commit()
             login_user(user)
             flash('Logged in successfully.', 'success')
             next_page = request.args.get('next')
@@ -179,39 +311,50 @@ def logout():
 @app.route('/farmer/dashboard')
 @role_required('farmer')
 def farmer_dashboard():
-    products = Product.query.filter_by(farmer_id=current_user.id).order_by(Product.created_at.desc()).all()
-    
-    orders = Order.query.join(Product).join(User, Order.customer_id == User.id).filter(
-        Product.farmer_id == current_user.id
-    ).with_entities(
-        Order.id, 
-        Order.quantity, 
-        Order.total_price, 
-        Order.order_date,
-        Order.is_new,
-        Product.name.label('product_name'),
-        User.name.label('customer_name')
-    ).order_by(Order.order_date.desc()).all()
-
-    new_orders = Order.query.join(Product).filter(
-        Product.farmer_id == current_user.id, 
-        Order.is_new == True
-    ).all()
+    farmer_id = current_user.id
+
+    # Mark new orders as read before streaming so a failed write surfaces as an
+    # error instead of after a page that looks successful. The write runs on its
+    # own connection so it does not expire objects the template still needs.
+    new_ids = set(db.session.scalars(
+        select(Order.id).join(Product).filter(Product.farmer_id == farmer_id, Order.is_new == True)
+    ))
+    if new_ids:
+        with db.engine.begin() as connection:
+            marked = connection.execute(
+                update(Order).where(Order.id.in_(new_ids), Order.is_new == True).values(is_new=False)
+            ).rowcount
+            connection.execute(
+                update(User).where(User.id == farmer_id).values(new_order_count=User.new_order_count - marked)
+            )
+
+    products = Product.query.filter_by(farmer_id=farmer_id).order_by(Product.created_at.desc()).all()
     
-    for order in new_orders:
-        order.is_new = False
-    
-    db.session.commit()
-    return render_template('farmer_dashboard.html', products=products, orders=orders)
+    # Catch stray lazy loads during development only; raising mid-stream in
+    # production would cut the page off after a 200
+    strict_loading = [raiseload('*')] if app.debug or app.testing else []
+
+    # The filter's product join also fills Order.product; customer is eager-loaded
+    # so the template never triggers lazy loads
+    orders = stream_scalars(select(Order).join(Order.product).options(
+        contains_eager(Order.product),
+        joinedload(Order.customer),
+        *strict_loading
+    ).filter(
+        Product.farmer_id == farmer_id
+    ).order_by(Order.order_date.desc()))
+
+    return app.response_class(stream_template('farmer_dashboard.html', products=products, orders=orders, new_ids=new_ids))
 
 @app.route('/api/farmer/new_orders_count')
 @role_required('farmer')
 def new_orders_count():
-    count = Order.query.join(Product).filter(
-        Product.farmer_id == current_user.id, 
-        Order.is_new == True
-    ).count()
-    return jsonify({'new_orders_count': count})
+    # The counter is maintained on write and current_user is already loaded
+    count = current_user.new_order_count
+    response = jsonify({'new_orders_count': count})
+    response.set_etag(hashlib.md5(f'{count}'.encode()).hexdigest())
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 @app.route('/farmer/add_product', methods=['GET', 'POST'])
 @role_required('farmer')
@@ -277,10 +420,32 @@ def delete_product(product_id):
 # =========================================================
 # Customer Routes
 # =========================================================
+PRODUCTS_PER_PAGE = 24
+
 @app.route('/products')
 def products():
-    products = Product.query.filter(Product.quantity > 0).order_by(Product.created_at.desc()).all()
-    return render_template('products.html', products=products)
+    query = Product.query.filter(Product.quantity > 0)
+
+    # Keyset pagination: the cursor is the (created_at, id) of the last product shown
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            created_at, last_id = cursor.rsplit(',', 1)
+            created_at, last_id = datetime.fromisoformat(created_at), int(last_id)
+        except ValueError:
+            abort(400)
+        query = query.filter(or_(
+            Product.created_at < created_at,
+            and_(Product.created_at == created_at, Product.id < last_id)
+        ))
+
+    products = query.order_by(Product.created_at.desc(), Product.id.desc()).limit(PRODUCTS_PER_PAGE + 1).all()
+    next_cursor = None
+    if len(products) > PRODUCTS_PER_PAGE:
+        products = products[:PRODUCTS_PER_PAGE]
+        last = products[-1]
+        next_cursor = f'{last.created_at.isoformat()},{last.id}'
+    return render_template('products.html', products=products, cursor=cursor, next_cursor=next_cursor)
 
 @app.route('/product/<int:product_id>')
 def product_detail(product_id):
@@ -291,7 +456,7 @@ def product_detail(product_id):
 @login_required
 def order_product(product_id):
     product = Product.query.get_or_404(product_id)
-    if not current_user.is_customer():
+    if current_user.role != 'customer':
         flash('Only customers can place orders', 'warning')
         return redirect(url_for('products'))
     if request.method == 'POST':
@@ -299,12 +464,18 @@ def order_product(product_id):
         if qty <= 0:
             flash('Invalid quantity', 'danger')
             return redirect(url_for('order_product', product_id=product_id))
-        if qty > product.quantity:
+        # Decrement stock only if enough is left, atomically at the database
+        result = db.session.execute(
+            update(Product)
+            .where(Product.id == product.id, Product.quantity >= qty)
+            .values(quantity=Product.quantity - qty)
+        )
+        if result.rowcount == 0:
+            db.session.rollback()
             flash('Not enough stock available', 'danger')
             return redirect(url_for('order_product', product_id=product_id))
         total = qty * product.price
         order = Order(customer_id=current_user.id, product_id=product.id, quantity=qty, total_price=total, is_new=True)
-        product.quantity -= qty
         db.session.add(order)
         db.session.commit()
         flash('Order placed successfully', 'success')
@@ -314,10 +485,16 @@ def order_product(product_id):
 @app.route('/my_orders')
 @login_required
 def my_orders():
-    if current_user.is_customer():
-        orders = Order.query.join(Product).filter(Order.customer_id == current_user.id).order_by(Order.order_date.desc()).all()
+    if current_user.role == 'customer':
+        query = select(Order).options(joinedload(Order.product).joinedload(Product.farmer)).filter(
+            Order.customer_id == current_user.id
+        )
     else:
-        orders = Order.query.join(Product).filter(Product.farmer_id == current_user.id).order_by(Order.order_date.desc()).all()
+        # Reuse the join needed for the farmer filter to populate Order.product
+        query = select(Order).join(Order.product).options(contains_eager(Order.product).joinedload(Product.farmer)).filter(
+            Product.farmer_id == current_user.id
+        )
+    orders = db.session.scalars(query.order_by(Order.order_date.desc())).all()
     return render_template('my_orders.html', orders=orders)
 
 
@@ -327,10 +504,16 @@ def my_orders():
 @app.route('/admin/dashboard')
 @role_required('admin')
 def admin_dashboard():
-    total_users = User.query.count()
-    total_products = Product.query.count()
-    total_orders = Order.query.count()
-    recent_orders = Order.query.order_by(Order.order_date.desc()).limit(10).all()
+    # All three totals come back in one round-trip
+    total_users, total_products, total_orders = db.session.execute(select(
+        select(func.count()).select_from(User).scalar_subquery(),
+        select(func.count()).select_from(Product).scalar_subquery(),
+        select(func.count()).select_from(Order).scalar_subquery()
+    )).one()
+    recent_orders = Order.query.options(
+        joinedload(Order.product),
+        joinedload(Order.customer)
+    ).order_by(Order.order_date.desc()).limit(10).all()
     return render_template('admin_dashboard.html', total_users=total_users, total_products=total_products, total_orders=total_orders, recent_orders=recent_orders)
 
 @app.route('/admin/users')
@@ -362,39 +545,65 @@ def admin_edit_user(user_id):
 @app.route('/admin/products')
 @role_required('admin')
 def admin_products():
-    products = Product.query.order_by(Product.created_at.desc()).all()
-    return render_template('admin_products.html', products=products)
+    products = stream_scalars(select(Product).options(joinedload(Product.farmer)).order_by(Product.created_at.desc()))
+    return app.response_class(stream_template('admin_products.html', products=products))
+
+# create_all() skips tables that already exist, so add any missing indexes
+def create_missing_indexes():
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+
+# Adds User.new_order_count to databases created before it existed and backfills it
+def add_new_order_count_column():
+    columns = {column['name'] for column in inspect(db.engine).get_columns('user')}
+    if 'new_order_count' in columns:
+        return
+    with db.engine.begin() as connection:
+        connection.execute(text('ALTER TABLE user ADD COLUMN new_order_count INTEGER NOT NULL DEFAULT 0'))
+        connection.execute(text(
+            'UPDATE user SET new_order_count = ('
+            'SELECT count(*) FROM "order" JOIN product ON product.id = "order".product_id '
+            'WHERE product.farmer_id = user.id AND "order".is_new = 1)'
+        ))
+
+# Precomputed argon2id hashes of the demo passwords ('123', 'farmerpass', 'custpass'),
+# so first boot does not spend time running the KDF three times
+_ADMIN_HASH = '$argon2id$v=19$m=65536,t=2,p=2$abYCZeE9+JIqeXtTCP8Klw$t04YRhTO8iA23/QbdpgVrFo08gVfIN/TIp8aD1S3AgY'
+_FARMER_HASH = '$argon2id$v=19$m=65536,t=2,p=2$259BXWNEVlczneRT7mcotQ$8yEmut6Pxl39HOlQg6fGoA5VQ3KdjxuwP0LJcTzkvFE'
+_CUSTOMER_HASH = '$argon2id$v=19$m=65536,t=2,p=2$pFRhXjLzO3WhNm6iMZMreg$2zSxNHn5ysM9AUhMPzgY1+/lkUW/IVOkxlyK8HJkL/o'
 
 # Create demo data if DB is empty
 def create_demo_data():
     if User.query.first():
         return
     
-    # Admin User (Troubleshooting password is '123')
-    admin = User(username='admin', role='admin', name='System Admin', contact_number='0000000000')
-    admin.set_password('123') 
-
-    # Farmer User
-    farmer = User(username='farmer1', role='farmer', name='Alice Farmer', contact_number='9876543210')
-    farmer.set_password('farmerpass')
-    
-    # Customer User
-    customer = User(username='cust1', role='customer', name='Bob Customer', contact_number='9998887776')
-    customer.set_password('custpass')
-    
-    db.session.add_all([admin, farmer, customer])
-    db.session.commit()
+    # Everything is inserted in one transaction with one executemany per table
+    db.session.execute(insert(User), [
+        # Admin User (Troubleshooting password is '123')
+        dict(username='admin', role='admin', name='System Admin', contact_number='0000000000', password_hash=_ADMIN_HASH),
+        # Farmer User
+        dict(username='farmer1', role='farmer', name='Alice Farmer', contact_number='9876543210', password_hash=_FARMER_HASH),
+        # Customer User
+        dict(username='cust1', role='customer', name='Bob Customer', contact_number='9998887776', password_hash=_CUSTOMER_HASH),
+    ])
+    farmer_id = db.session.execute(select(User.id).filter_by(username='farmer1')).scalar_one()
+    customer_id = db.session.execute(select(User.id).filter_by(username='cust1')).scalar_one()
     
     # Demo Products (using AI image simulation)
-    p1 = Product(farmer_id=farmer.id, name='Tomatoes', description='Fresh red tomatoes', quantity=100, price=30.0, image_url=generate_product_image_url('Tomatoes'))
-    p2 = Product(farmer_id=farmer.id, name='Spinach', description='Leafy spinach', quantity=50, price=20.0, image_url=generate_product_image_url('Spinach'))
-    p3 = Product(farmer_id=farmer.id, name='Cabbage', description='Crisp green cabbage', quantity=40, price=25.0, image_url=generate_product_image_url('Cabbage'))
-    db.session.add_all([p1, p2, p3])
-    db.session.commit()
+    db.session.execute(insert(Product), [
+        dict(farmer_id=farmer_id, name='Tomatoes', description='Fresh red tomatoes', quantity=100, price=30.0, image_url=generate_product_image_url('Tomatoes')),
+        dict(farmer_id=farmer_id, name='Spinach', description='Leafy spinach', quantity=50, price=20.0, image_url=generate_product_image_url('Spinach')),
+        dict(farmer_id=farmer_id, name='Cabbage', description='Crisp green cabbage', quantity=40, price=25.0, image_url=generate_product_image_url('Cabbage')),
+    ])
+    tomatoes_id = db.session.execute(select(Product.id).filter_by(name='Tomatoes')).scalar_one()
     
-    # Demo Orders
-    o1 = Order(customer_id=customer.id, product_id=p1.id, quantity=5, total_price=150.0, is_new=False)
-    db.session.add(o1)
+    # Demo Orders. Bulk inserts skip the after_insert hook that maintains
+    # User.new_order_count, so any order added here with is_new=True must also
+    # bump its farmer's counter.
+    db.session.execute(insert(Order), [
+        dict(customer_id=customer_id, product_id=tomatoes_id, quantity=5, total_price=150.0, is_new=False),
+    ])
     db.session.commit()
 
     print('Demo data created: admin/farmer1/cust1 with passwords, and products.')
@@ -402,5 +611,7 @@ def create_demo_data():
 if __name__ == '__main__':
     with app.app_context():
         db.create_all() 
+        create_missing_indexes()
+        add_new_order_count_column()
         create_demo_data()
     app.run(debug=True)
\ No newline at end of file